@@ -3,10 +3,34 @@ from pytensor.link.utils import unique_name_generator
 
 
 class PytorchLinker(JITLinker):
-    """A `Linker` that compiles NumPy-based operations using torch.compile."""
-
-    def __init__(self, *args, **kwargs):
+    """A `Linker` that compiles NumPy-based operations using torch.compile.
+
+    Parameters
+    ----------
+    compile_mode
+        The `mode` passed to ``torch.compile``, e.g. ``"reduce-overhead"`` to capture
+        CUDA graphs and cut per-call launch overhead.
+    fullgraph
+        Passed to ``torch.compile``. Graphs with data-dependent control flow or shapes
+        cannot be captured as a single graph and will fail to compile with it.
+    keep_on_device
+        If True, outputs are returned as ``torch.Tensor`` on the device they were
+        computed on, instead of being copied to host NumPy arrays. Updates of shared
+        variables are still copied, so their values stay NumPy arrays.
+    """
+
+    def __init__(
+        self,
+        *args,
+        compile_mode: str | None = None,
+        fullgraph: bool = False,
+        keep_on_device: bool = False,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
+        self.compile_mode = compile_mode
+        self.fullgraph = fullgraph
+        self.keep_on_device = keep_on_device
         self.gen_functors = []
 
     def fgraph_convert(self, fgraph, input_storage, storage_map, **kwargs):
@@ -42,6 +66,25 @@ class PytorchLinker(JITLinker):
 
         from pytensor.link.pytorch.dispatch import pytorch_typify
 
+        compile_kwargs = {}
+        if self.compile_mode is not None:
+            compile_kwargs["mode"] = self.compile_mode
+        if self.fullgraph:
+            compile_kwargs["fullgraph"] = True
+
+        keep_on_device = self.keep_on_device
+        # CUDA graph outputs are static buffers overwritten by the next replay
+        clone_outputs = keep_on_device and self.compile_mode == "reduce-overhead"
+        # Shared variable updates are always stored back as NumPy arrays
+        update_outputs = frozenset(self.fgraph.update_mapping or ())
+
+        def convert_output(i, out):
+            if not keep_on_device or i in update_outputs:
+                return out.cpu().numpy()
+            if clone_outputs:
+                return out.clone()
+            return out
+
         class wrapper:
             """
             Pytorch would fail compiling our method when trying
@@ -54,7 +97,7 @@ class PytorchLinker(JITLinker):
             """
 
             def __init__(self, fn, gen_functors):
-                self.fn = torch.compile(fn)
+                self.fn = torch.compile(fn, **compile_kwargs)
                 self.gen_functors = gen_functors.copy()
 
             def __call__(self, *inputs, **kwargs):
@@ -72,7 +115,7 @@ class PytorchLinker(JITLinker):
                     if getattr(pytensor.link.utils, n[1:], False):
                         delattr(pytensor.link.utils, n[1:])
 
-                return tuple(out.cpu().numpy() for out in outs)
+                return tuple(convert_output(i, out) for i, out in enumerate(outs))
 
             def __del__(self):
                 del self.gen_functors
@@ -0,0 +1,32 @@
+import os
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def torch_compile_cache():
+    """Persist torch.compile artifacts in the file named by `PYTENSOR_TORCH_CACHE`."""
+    cache_path = os.environ.get("PYTENSOR_TORCH_CACHE")
+    try:
+        import torch
+    except ImportError:
+        torch = None
+    if (
+        not cache_path
+        or torch is None
+        or not hasattr(torch.compiler, "save_cache_artifacts")
+    ):
+        yield
+        return
+
+    cache_path = Path(cache_path)
+    if cache_path.exists():
+        torch.compiler.load_cache_artifacts(cache_path.read_bytes())
+
+    yield
+
+    artifacts = torch.compiler.save_cache_artifacts()
+    if artifacts is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(artifacts[0])
@@ -1,5 +1,6 @@
 import re
 from copy import copy
+from typing import ClassVar
 
 import numpy as np
 import pytest
@@ -8,8 +9,8 @@ from numpy.testing import assert_array_equal, assert_equal, assert_string_equal
 import pytensor
 import tests.unittest_tools as utt
 from pytensor.compile import DeepCopyOp
-from pytensor.compile.mode import get_default_mode
-from pytensor.graph.basic import Constant, equal_computations
+from pytensor.compile.mode import Mode, get_default_mode
+from pytensor.graph.basic import Constant, equal_computations, io_toposort
 from pytensor.tensor import get_vector_length
 from pytensor.tensor.basic import constant
 from pytensor.tensor.elemwise import DimShuffle
@@ -41,44 +42,59 @@ from pytensor.tensor.variable import (
     TensorConstant,
     TensorVariable,
 )
-from tests.tensor.utils import random
 
 
 pytestmark = pytest.mark.filterwarnings("error")
 
+_BOOL_1D = TensorType("bool", shape=(None,))
+_BOOL_2D = TensorType("bool", shape=(None, None))
+
+
+NUMPY_METHOD_CASES = [
+    (np.arccos, 0.5),
+    (np.arccosh, 1.0),
+    (np.arcsin, 0.5),
+    (np.arcsinh, 0.5),
+    (np.arctan, 0.5),
+    (np.arctanh, 0.5),
+    (np.cos, 0.5),
+    (np.cosh, 0.5),
+    (np.deg2rad, 0.5),
+    (np.exp, 0.5),
+    (np.exp2, 0.5),
+    (np.expm1, 0.5),
+    (np.log, 0.5),
+    (np.log10, 0.5),
+    (np.log1p, 0.5),
+    (np.log2, 0.5),
+    (np.rad2deg, 0.5),
+    (np.sin, 0.5),
+    (np.sinh, 0.5),
+    (np.sqrt, 0.5),
+    (np.tan, 0.5),
+    (np.tanh, 0.5),
+]
+
+
+@pytest.fixture(scope="module")
+def numpy_method_results():
+    # Compile all the cases as a single function, once, since only the
+    # results of the NumPy method overloads are being tested
+    xs = [dscalar(f"x_{fct.__name__}") for fct, _ in NUMPY_METHOD_CASES]
+    f = pytensor.function(
+        xs,
+        [fct(x) for x, (fct, _) in zip(xs, NUMPY_METHOD_CASES, strict=True)],
+        mode="FAST_COMPILE",
+    )
+    res = f(*(value for _, value in NUMPY_METHOD_CASES))
+    return dict(zip((fct for fct, _ in NUMPY_METHOD_CASES), res, strict=True))
 
-@pytest.mark.parametrize(
-    "fct, value",
-    [
-        (np.arccos, 0.5),
-        (np.arccosh, 1.0),
-        (np.arcsin, 0.5),
-        (np.arcsinh, 0.5),
-        (np.arctan, 0.5),
-        (np.arctanh, 0.5),
-        (np.cos, 0.5),
-        (np.cosh, 0.5),
-        (np.deg2rad, 0.5),
-        (np.exp, 0.5),
-        (np.exp2, 0.5),
-        (np.expm1, 0.5),
-        (np.log, 0.5),
-        (np.log10, 0.5),
-        (np.log1p, 0.5),
-        (np.log2, 0.5),
-        (np.rad2deg, 0.5),
-        (np.sin, 0.5),
-        (np.sinh, 0.5),
-        (np.sqrt, 0.5),
-        (np.tan, 0.5),
-        (np.tanh, 0.5),
-    ],
-)
-def test_numpy_method(fct, value):
-    x = dscalar("x")
-    y = fct(x)
-    f = pytensor.function([x], y)
-    utt.assert_allclose(np.nan_to_num(f(value)), np.nan_to_num(fct(value)))
+
+@pytest.mark.parametrize("fct, value", NUMPY_METHOD_CASES)
+def test_numpy_method(numpy_method_results, fct, value):
+    utt.assert_allclose(
+        np.nan_to_num(numpy_method_results[fct]), np.nan_to_num(fct(value))
+    )
 
 
 def test_dot_method():
@@ -138,104 +154,107 @@ def test_copy():
     assert_string_equal(y.name, "y")
 
 
-def test__getitem__Subtensor():
+def _op_types(inputs, outputs):
+    """Return the `Op` types of the nodes of a graph, in toposort order."""
+    return [type(node.op) for node in io_toposort(inputs, outputs)]
+
+
+def _last_op_type(inputs, outputs):
+    """Return the `Op` type of the last node of a graph, in toposort order."""
+    return type(io_toposort(inputs, outputs)[-1].op)
+
+
+def _all_op_types_are(inputs, outputs, op_type):
+    """Check that every node of a graph applies an `Op` of type `op_type`."""
+    return all(type(node.op) is op_type for node in io_toposort(inputs, outputs))
+
+
+@pytest.fixture
+def x_mat():
+    return matrix("x")
+
+
+def test__getitem__Subtensor(x_mat):
     # Make sure we get `Subtensor`s for basic indexing operations
-    x = matrix("x")
     i = iscalar("i")
 
-    z = x[i]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == Subtensor
+    z = x_mat[i]
+    assert _last_op_type([x_mat, i], [z]) is Subtensor
 
-    # This should ultimately do nothing (i.e. just return `x`)
-    z = x[()]
+    # This should ultimately do nothing (i.e. just return `x_mat`)
+    z = x_mat[()]
     assert len(z.owner.op.idx_list) == 0
-    # assert z is x
+    # assert z is x_mat
 
     # This is a poorly placed optimization that produces a `DimShuffle`
     # It lands in the `full_slices` condition in
     # `_tensor_py_operators.__getitem__`
-    z = x[..., None]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert all(op_type == DimShuffle for op_type in op_types)
+    z = x_mat[..., None]
+    assert _all_op_types_are([x_mat, i], [z], DimShuffle)
 
-    z = x[None, :, None, :]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert all(op_type == DimShuffle for op_type in op_types)
+    z = x_mat[None, :, None, :]
+    assert _all_op_types_are([x_mat, i], [z], DimShuffle)
 
     # This one lands in the non-`full_slices` condition in
     # `_tensor_py_operators.__getitem__`
-    z = x[:i, :, None]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[1:] == [DimShuffle, Subtensor]
+    z = x_mat[:i, :, None]
+    assert _op_types([x_mat, i], [z])[1:] == [DimShuffle, Subtensor]
 
-    z = x[:]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == Subtensor
+    z = x_mat[:]
+    assert _last_op_type([x_mat, i], [z]) is Subtensor
 
-    z = x[..., :]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == Subtensor
+    z = x_mat[..., :]
+    assert _last_op_type([x_mat, i], [z]) is Subtensor
 
-    z = x[..., i, :]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == Subtensor
+    z = x_mat[..., i, :]
+    assert _last_op_type([x_mat, i], [z]) is Subtensor
 
 
-def test__getitem__AdvancedSubtensor_bool():
-    x = matrix("x")
-    i = TensorType("bool", shape=(None, None))("i")
+def test__getitem__AdvancedSubtensor_bool(x_mat):
+    i = _BOOL_2D("i")
 
-    z = x[i]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == AdvancedSubtensor
+    z = x_mat[i]
+    assert _last_op_type([x_mat, i], [z]) is AdvancedSubtensor
 
-    i = TensorType("bool", shape=(None,))("i")
-    z = x[:, i]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == AdvancedSubtensor
+    i = _BOOL_1D("i")
+    z = x_mat[:, i]
+    assert _last_op_type([x_mat, i], [z]) is AdvancedSubtensor
 
-    i = TensorType("bool", shape=(None,))("i")
-    z = x[..., i]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == AdvancedSubtensor
+    z = x_mat[..., i]
+    assert _last_op_type([x_mat, i], [z]) is AdvancedSubtensor
 
     with pytest.raises(TypeError):
-        z = x[[True, False], i]
+        z = x_mat[[True, False], i]
 
-    z = x[ivector("b"), i]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == AdvancedSubtensor
+    z = x_mat[ivector("b"), i]
+    assert _last_op_type([x_mat, i], [z]) is AdvancedSubtensor
 
 
-def test__getitem__AdvancedSubtensor():
+def test__getitem__AdvancedSubtensor(x_mat):
     # Make sure we get `AdvancedSubtensor`s for basic indexing operations
-    x = matrix("x")
     i = ivector("i")
 
     # This is a `__getitem__` call that's redirected to `_tensor_py_operators.take`
-    z = x[i]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == AdvancedSubtensor
+    z = x_mat[i]
+    assert _last_op_type([x_mat, i], [z]) is AdvancedSubtensor
 
-    # This should index nothing (i.e. return an empty copy of `x`)
+    # This should index nothing (i.e. return an empty copy of `x_mat`)
     # We check that the index is empty
-    z = x[[]]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
+    z = x_mat[[]]
+    op_types = _op_types([x_mat, i], [z])
     assert op_types == [AdvancedSubtensor]
     assert isinstance(z.owner.inputs[1], TensorConstant)
 
-    z = x[:, i]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
+    z = x_mat[:, i]
+    op_types = _op_types([x_mat, i], [z])
     assert op_types == [MakeSlice, AdvancedSubtensor]
 
-    z = x[..., i, None]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
+    z = x_mat[..., i, None]
+    op_types = _op_types([x_mat, i], [z])
     assert op_types == [MakeSlice, AdvancedSubtensor]
 
-    z = x[i, None]
-    op_types = [type(node.op) for node in pytensor.graph.basic.io_toposort([x, i], [z])]
-    assert op_types[-1] == AdvancedSubtensor
+    z = x_mat[i, None]
+    assert _last_op_type([x_mat, i], [z]) is AdvancedSubtensor
 
 
 def test_print_constant():
@@ -277,7 +296,10 @@ def test_fixed_shape_variable_basic():
     assert x.type.shape == (4,)
     assert isinstance(x.shape.owner.op, Shape)
 
-    shape_fn = pytensor.function([x], x.shape)
+    # Only the rewritten graph is checked, so there's no need for C compilation
+    shape_fn = pytensor.function(
+        [x], x.shape, mode=Mode(linker="py", optimizer="fast_run")
+    )
     opt_shape = shape_fn.maker.fgraph.outputs[0]
     assert isinstance(opt_shape.owner.op, DeepCopyOp)
     assert isinstance(opt_shape.owner.inputs[0], Constant)
@@ -313,7 +335,7 @@ def test_dense_types():
 
 
 class TestTensorConstantSignature:
-    vals = [
+    vals: ClassVar[tuple] = (
         [np.nan, np.inf, 0, 1],
         [np.nan, np.inf, -np.inf, 1],
         [0, np.inf, -np.inf, 1],
@@ -326,18 +348,23 @@ class TestTensorConstantSignature:
         -np.inf,
         0,
         1,
-    ]
+    )
+
+    @classmethod
+    def setup_class(cls):
+        cls.sigs = [constant(val).signature() for val in cls.vals]
 
-    @pytest.mark.parametrize("val_1", vals)
-    @pytest.mark.parametrize("val_2", vals)
-    def test_nan_inf_constant_signature(self, val_1, val_2):
+    def test_nan_inf_constant_signature(self):
         # Test that the signature of a constant tensor containing NaN and Inf
         # values is correct.
         # We verify that signatures of two rows i, j in the matrix above are
         # equal if and only if i == j.
-        x = constant(val_1)
-        y = constant(val_2)
-        assert (x.signature() == y.signature()) == (val_1 is val_2)
+        # Rows are compared by position, rather than with `is`, which
+        # would depend on Python's interning of small numbers
+        n_vals = len(self.vals)
+        for i in range(n_vals):
+            for j in range(n_vals):
+                assert (self.sigs[i] == self.sigs[j]) == (i == j)
 
     def test_nan_nan(self):
         # Also test that nan !=0 and nan != nan.
@@ -363,17 +390,24 @@ class TestTensorConstantSignature:
         assert hash(x_sig) == hash(y_sig)
 
 
+_VALS = (
+    np.arange(4, dtype=pytensor.config.floatX).reshape(2, 2),
+    np.arange(4, 8, dtype=pytensor.config.floatX).reshape(2, 2),
+)
+
+
 class TestTensorInstanceMethods:
-    def setup_method(self):
-        self.vars = matrices("X", "Y")
-        self.vals = [
-            m.astype(pytensor.config.floatX) for m in [random(2, 2), random(2, 2)]
-        ]
+    # These tests only check the results of the methods, so all graphs
+    # are compiled without rewrites and with the Python linker
+    py_mode = Mode(linker="py", optimizer=None)
+    vars = matrices("X", "Y")
+    vals = _VALS
 
     def test_repeat(self):
         X, _ = self.vars
         x, _ = self.vals
-        assert_array_equal(X.repeat(2).eval({X: x}), x.repeat(2))
+        f = pytensor.function([X], X.repeat(2), mode=self.py_mode)
+        assert_array_equal(f(x), x.repeat(2))
 
     def test_trace(self):
         X, _ = self.vars
@@ -384,87 +418,99 @@ class TestTensorInstanceMethods:
     def test_ravel(self):
         X, _ = self.vars
         x, _ = self.vals
-        assert_array_equal(X.ravel().eval({X: x}), x.ravel())
+        f = pytensor.function([X], X.ravel(), mode=self.py_mode)
+        assert_array_equal(f(x), x.ravel())
 
     def test_diagonal(self):
         X, _ = self.vars
         x, _ = self.vals
-        assert_array_equal(X.diagonal().eval({X: x}), x.diagonal())
-        assert_array_equal(X.diagonal(1).eval({X: x}), x.diagonal(1))
-        assert_array_equal(X.diagonal(-1).eval({X: x}), x.diagonal(-1))
-        for offset, axis1, axis2 in [(1, 0, 1), (-1, 0, 1), (0, 1, 0), (-2, 1, 0)]:
-            assert_array_equal(
-                X.diagonal(offset, axis1, axis2).eval({X: x}),
-                x.diagonal(offset, axis1, axis2),
-            )
+        diagonal_args = [
+            (),
+            (1,),
+            (-1,),
+            (1, 0, 1),
+            (-1, 0, 1),
+            (0, 1, 0),
+            (-2, 1, 0),
+        ]
+        expected = {args: x.diagonal(*args) for args in diagonal_args}
+        f = pytensor.function(
+            [X], [X.diagonal(*args) for args in diagonal_args], mode=self.py_mode
+        )
+        for args, res in zip(diagonal_args, f(x), strict=True):
+            assert_array_equal(res, expected[args])
 
     def test_take(self):
         X, _ = self.vars
         x, _ = self.vals
-        indices = [1, 0, 3]
-        assert_array_equal(X.take(indices).eval({X: x}), x.take(indices))
-        indices = [1, 0, 1]
-        assert_array_equal(X.take(indices, 1).eval({X: x}), x.take(indices, 1))
-        indices = np.array([-10, 5, 12], dtype="int32")
-        assert_array_equal(
-            X.take(indices, 1, mode="wrap").eval({X: x}),
-            x.take(indices, 1, mode="wrap"),
-        )
-        assert_array_equal(
-            X.take(indices, -1, mode="wrap").eval({X: x}),
-            x.take(indices, -1, mode="wrap"),
-        )
-        assert_array_equal(
-            X.take(indices, 1, mode="clip").eval({X: x}),
-            x.take(indices, 1, mode="clip"),
-        )
-        assert_array_equal(
-            X.take(indices, -1, mode="clip").eval({X: x}),
-            x.take(indices, -1, mode="clip"),
+        wrap_indices = np.array([-10, 5, 12], dtype="int32")
+        advanced_indices = [[1, 0, 1], [0, 1, 1]]
+        take_args = [
+            ([1, 0, 3], None, "raise"),
+            ([1, 0, 1], 1, "raise"),
+            (wrap_indices, 1, "wrap"),
+            (wrap_indices, -1, "wrap"),
+            (wrap_indices, 1, "clip"),
+            (wrap_indices, -1, "clip"),
+            (advanced_indices, 1, "raise"),
+        ]
+        f = pytensor.function(
+            [X],
+            [X.take(indices, axis, mode=mode) for indices, axis, mode in take_args]
+            # Test equivalent advanced indexing
+            + [X[:, advanced_indices]],
+            mode=self.py_mode,
         )
-        # Test error handling
+        *take_res, advanced_res = f(x)
+        for (indices, axis, mode), res in zip(take_args, take_res, strict=True):
+            assert_array_equal(res, x.take(indices, axis, mode=mode))
+        assert_array_equal(advanced_res, x[:, advanced_indices])
+
+        # Test error handling, with the default mode so that the second
+        # check goes through a compiled (fused) graph
         with pytest.raises(IndexError):
-            X.take(indices).eval({X: x})
+            X.take(wrap_indices).eval({X: x})
         with pytest.raises(IndexError):
-            (2 * X.take(indices)).eval({X: x})
+            (2 * X.take(wrap_indices)).eval({X: x})
         with pytest.raises(TypeError):
             X.take([0.0])
-        indices = [[1, 0, 1], [0, 1, 1]]
-        assert_array_equal(X.take(indices, 1).eval({X: x}), x.take(indices, 1))
-        # Test equivalent advanced indexing
-        assert_array_equal(X[:, indices].eval({X: x}), x[:, indices])
 
-    def test_set_inc(self):
-        x = matrix("x")
+    def test_set_inc(self, x_mat):
         idx = [0]
         y = 5
 
-        assert equal_computations([x[:, idx].set(y)], [set_subtensor(x[:, idx], y)])
-        assert equal_computations([x[:, idx].inc(y)], [inc_subtensor(x[:, idx], y)])
-
-    def test_set_item_error(self):
-        x = matrix("x")
+        expected_set = set_subtensor(x_mat[:, idx], y)
+        expected_inc = inc_subtensor(x_mat[:, idx], y)
+        assert equal_computations([x_mat[:, idx].set(y)], [expected_set])
+        assert equal_computations([x_mat[:, idx].inc(y)], [expected_inc])
 
+    def test_set_item_error(self, x_mat):
         msg = re.escape("Use the output of `x[idx].set` or `x[idx].inc` instead.")
         with pytest.raises(TypeError, match=msg):
-            x[0] = 5
+            x_mat[0] = 5
         with pytest.raises(TypeError, match=msg):
-            x[0] += 5
+            x_mat[0] += 5
 
     def test_transpose(self):
         X, _ = self.vars
         x, _ = self.vals
 
         # Turn (2,2) -> (1,2)
-        X, x = X[1:, :], x[1:, :]
+        X_sub, x_sub = X[1:, :], x[1:, :]
 
-        assert_array_equal(X.transpose(0, 1).eval({X: x}), x.transpose(0, 1))
-        assert_array_equal(X.transpose(1, 0).eval({X: x}), x.transpose(1, 0))
+        f = pytensor.function(
+            [X], [X_sub.transpose(0, 1), X_sub.transpose(1, 0)], mode=self.py_mode
+        )
+        res_01, res_10 = f(x)
+        assert_array_equal(res_01, x_sub.transpose(0, 1))
+        assert_array_equal(res_10, x_sub.transpose(1, 0))
 
         # Test handing in tuples, lists and np.arrays
-        equal_computations([X.transpose((1, 0))], [X.transpose(1, 0)])
-        equal_computations([X.transpose([1, 0])], [X.transpose(1, 0)])
-        equal_computations([X.transpose(np.array([1, 0]))], [X.transpose(1, 0)])
+        assert equal_computations([X_sub.transpose((1, 0))], [X_sub.transpose(1, 0)])
+        assert equal_computations([X_sub.transpose([1, 0])], [X_sub.transpose(1, 0)])
+        assert equal_computations(
+            [X_sub.transpose(np.array([1, 0]))], [X_sub.transpose(1, 0)]
+        )
 
 
 def test_deprecated_import():